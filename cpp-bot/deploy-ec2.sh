@@ -63,7 +63,7 @@ fi
 
 log_info "Installing Python dependencies for live trading..."
 
-pip3 install --user py-clob-client web3 eth-account
+pip3 install --user py-clob-client web3 eth-account msgpack coincurve "eth-hash[pycryptodome]"
 
 # Verify installation
 if python3 -c "from py_clob_client.client import ClobClient" 2>/dev/null; then
@@ -200,7 +200,7 @@ log_info "Setting up Python order executor..."
 
 mkdir -p "$PROJECT_DIR/scripts"
 if [ -f "../../scripts/order_executor.py" ]; then
-    cp ../../scripts/order_executor.py "$PROJECT_DIR/scripts/"
+    cp ../../scripts/order_executor.py ../../scripts/executor_core.py "$PROJECT_DIR/scripts/"
     chmod +x "$PROJECT_DIR/scripts/order_executor.py"
 fi
 
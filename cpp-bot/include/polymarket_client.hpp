@@ -3,6 +3,8 @@
 #include <string>
 #include <vector>
 #include <memory>
+#include <optional>
+#include <sys/types.h>
 #include <nlohmann/json.hpp>
 
 namespace poly {
@@ -41,6 +43,13 @@ struct OrderResult {
     std::string error;
 };
 
+struct OrderRequest {
+    std::string token_id;
+    std::string side;  // "BUY" or "SELL"
+    double size = 0.0;
+    double price = 0.0;
+};
+
 struct BalanceResult {
     bool success = false;
     double balance = 0.0;
@@ -66,10 +75,21 @@ public:
         const std::string& api_url = "https://clob.polymarket.com",
         const std::string& gamma_url = "https://gamma-api.polymarket.com"
     );
+    ~PolymarketClient();
     
     // Set path to Python order executor script
     void set_executor_path(const std::string& path);
     
+    // Set Unix socket path of the executor daemon
+    void set_executor_socket(const std::string& path);
+    
+    // Launch the executor daemon (python3 <executor> serve) unless one is
+    // already serving; a daemon started here exits with this process
+    bool start_executor_daemon();
+    
+    // Stop the daemon started by start_executor_daemon(), if any
+    void stop_executor_daemon();
+    
     // ============ MARKET DATA (Read-Only) ============
     
     // Market discovery
@@ -89,6 +109,9 @@ public:
         double price
     );
     
+    // Place several limit orders at once; submitted concurrently by the daemon
+    std::vector<OrderResult> place_orders(const std::vector<OrderRequest>& orders);
+    
     // Place a market order (FOK - Fill or Kill)
     OrderResult place_market_order(
         const std::string& token_id,
@@ -99,6 +122,9 @@ public:
     // Cancel an order
     bool cancel_order(const std::string& order_id);
     
+    // Cancel several orders with one request; true only if all were cancelled
+    bool cancel_orders(const std::vector<std::string>& order_ids);
+    
     // Cancel all open orders
     bool cancel_all_orders();
     
@@ -117,6 +143,8 @@ private:
     std::string api_url_;
     std::string gamma_url_;
     std::string executor_path_ = "scripts/order_executor.py";
+    std::string executor_socket_ = "/tmp/polymkt.sock";
+    pid_t executor_pid_ = -1;  // Daemon started by this client, -1 if none
     
     // HTTP request helpers
     json http_get(const std::string& url);
@@ -124,6 +152,12 @@ private:
     
     // Execute Python script for live trading
     json execute_python(const std::string& args);
+    
+    // Send a command to the executor daemon; nullopt if it is not reachable
+    std::optional<json> execute_daemon(const std::string& cmd, const json& args);
+    
+    // Run a command via the daemon, falling back to a one-shot script call
+    json execute(const std::string& cmd, const json& args, const std::string& cli_args);
 };
 
 } // namespace poly
@@ -216,6 +216,11 @@ int main() {
         if (polymarket_client->is_live_trading_available()) {
             std::cout << "[WALLET] ✓ Live trading credentials detected" << std::endl;
             poly::add_log("info", "WALLET", "Live trading credentials configured");
+            
+            // Keep the order executor warm instead of spawning Python per order
+            if (polymarket_client->start_executor_daemon()) {
+                std::cout << "[WALLET] ✓ Order executor daemon started" << std::endl;
+            }
         } else {
             std::cout << "[WALLET] ℹ️  Paper trading mode (no credentials)" << std::endl;
             poly::add_log("info", "WALLET", "Paper trading mode - set POLYMARKET_PRIVATE_KEY for live trading");
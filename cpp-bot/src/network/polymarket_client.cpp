@@ -7,6 +7,16 @@
 #include <memory>
 #include <cstdio>
 #include <cstring>
+#include <cstdlib>
+#include <csignal>
+#include <sys/socket.h>
+#include <sys/un.h>
+#include <sys/time.h>
+#include <sys/wait.h>
+#include <unistd.h>
+#ifdef __linux__
+#include <sys/prctl.h>
+#endif
 
 namespace poly {
 
@@ -15,6 +25,55 @@ namespace {
         userp->append(static_cast<char*>(contents), size * nmemb);
         return size * nmemb;
     }
+    
+    // Connect to a Unix stream socket; -1 if nothing is listening on it
+    int connect_unix(const std::string& path) {
+        int fd = socket(AF_UNIX, SOCK_STREAM, 0);
+        if (fd < 0) {
+            return -1;
+        }
+        
+        sockaddr_un addr{};
+        addr.sun_family = AF_UNIX;
+        std::strncpy(addr.sun_path, path.c_str(), sizeof(addr.sun_path) - 1);
+        
+        if (connect(fd, reinterpret_cast<sockaddr*>(&addr), sizeof(addr)) < 0) {
+            close(fd);
+            return -1;
+        }
+        return fd;
+    }
+    
+    bool send_all(int fd, const uint8_t* data, size_t len) {
+        while (len > 0) {
+            ssize_t n = send(fd, data, len, MSG_NOSIGNAL);
+            if (n <= 0) return false;
+            data += n;
+            len -= static_cast<size_t>(n);
+        }
+        return true;
+    }
+    
+    OrderResult parse_order_result(const json& response, double price) {
+        OrderResult result;
+        result.success = response.value("success", false);
+        result.order_id = response.value("order_id", "");
+        result.status = response.value("status", "");
+        result.filled_amount = response.value("size", 0.0);
+        result.price = response.value("price", price);
+        result.error = response.value("error", "");
+        return result;
+    }
+    
+    bool recv_all(int fd, uint8_t* data, size_t len) {
+        while (len > 0) {
+            ssize_t n = recv(fd, data, len, 0);
+            if (n <= 0) return false;
+            data += n;
+            len -= static_cast<size_t>(n);
+        }
+        return true;
+    }
 }
 
 PolymarketClient::PolymarketClient(
@@ -24,10 +83,82 @@ PolymarketClient::PolymarketClient(
     curl_global_init(CURL_GLOBAL_ALL);
 }
 
+PolymarketClient::~PolymarketClient() {
+    stop_executor_daemon();
+}
+
 void PolymarketClient::set_executor_path(const std::string& path) {
     executor_path_ = path;
 }
 
+void PolymarketClient::set_executor_socket(const std::string& path) {
+    executor_socket_ = path;
+}
+
+bool PolymarketClient::start_executor_daemon() {
+    // Reuse a daemon that is already serving rather than starting another
+    int fd = connect_unix(executor_socket_);
+    if (fd >= 0) {
+        close(fd);
+        return true;
+    }
+    
+    const char* path = executor_path_.c_str();
+    const char* socket_path = executor_socket_.c_str();
+    pid_t parent = getpid();
+    pid_t pid = fork();
+    if (pid < 0) {
+        return false;
+    }
+    if (pid == 0) {
+#ifdef __linux__
+        // Exit with the engine, even when it is killed with SIGKILL
+        prctl(PR_SET_PDEATHSIG, SIGTERM);
+#endif
+        if (getppid() != parent) {
+            _exit(1);  // Engine already gone
+        }
+        execlp("python3", "python3", path, "serve", "--socket", socket_path,
+               static_cast<char*>(nullptr));
+        _exit(127);
+    }
+    executor_pid_ = pid;
+    
+    // Only report success once the daemon accepts connections
+    for (int attempt = 0; attempt < 200; ++attempt) {
+        fd = connect_unix(executor_socket_);
+        if (fd >= 0) {
+            close(fd);
+            return true;
+        }
+        if (waitpid(pid, nullptr, WNOHANG) == pid) {
+            executor_pid_ = -1;  // Exited, e.g. another daemon holds the socket
+            return false;
+        }
+        usleep(50 * 1000);
+    }
+    return false;
+}
+
+void PolymarketClient::stop_executor_daemon() {
+    if (executor_pid_ <= 0) {
+        return;
+    }
+    
+    // SIGTERM lets the daemon remove its socket; escalate if it hangs
+    kill(executor_pid_, SIGTERM);
+    for (int attempt = 0; attempt < 50; ++attempt) {
+        if (waitpid(executor_pid_, nullptr, WNOHANG) == executor_pid_) {
+            executor_pid_ = -1;
+            return;
+        }
+        usleep(100 * 1000);
+    }
+    kill(executor_pid_, SIGKILL);
+    waitpid(executor_pid_, nullptr, 0);
+    executor_pid_ = -1;
+}
+
 std::vector<Market> PolymarketClient::get_markets(const std::string& query) {
     std::string url = gamma_url_ + "/markets";
     if (!query.empty()) {
@@ -168,6 +299,59 @@ json PolymarketClient::execute_python(const std::string& args) {
     }
 }
 
+std::optional<json> PolymarketClient::execute_daemon(const std::string& cmd, const json& args) {
+    int fd = connect_unix(executor_socket_);
+    if (fd < 0) {
+        return std::nullopt;
+    }
+    
+    // Don't let a stuck exchange call hang the engine forever
+    timeval timeout{30, 0};
+    setsockopt(fd, SOL_SOCKET, SO_RCVTIMEO, &timeout, sizeof(timeout));
+    
+    // Once connected, never fall back: the order may already be submitted.
+    // Frames are a little-endian uint32 length followed by a msgpack payload.
+    std::vector<uint8_t> payload = json::to_msgpack(json{{"cmd", cmd}, {"args", args}});
+    uint32_t length = static_cast<uint32_t>(payload.size());
+    uint8_t header[4] = {
+        static_cast<uint8_t>(length), static_cast<uint8_t>(length >> 8),
+        static_cast<uint8_t>(length >> 16), static_cast<uint8_t>(length >> 24)
+    };
+    if (!send_all(fd, header, sizeof(header)) || !send_all(fd, payload.data(), payload.size())) {
+        close(fd);
+        return json{{"success", false}, {"error", "Failed to write to executor daemon"}};
+    }
+    
+    if (!recv_all(fd, header, sizeof(header))) {
+        close(fd);
+        return json{{"success", false}, {"error", "No response from executor daemon"}};
+    }
+    length = static_cast<uint32_t>(header[0]) | (static_cast<uint32_t>(header[1]) << 8)
+           | (static_cast<uint32_t>(header[2]) << 16) | (static_cast<uint32_t>(header[3]) << 24);
+    std::vector<uint8_t> body(length);
+    if (!recv_all(fd, body.data(), body.size())) {
+        close(fd);
+        return json{{"success", false}, {"error", "Truncated response from executor daemon"}};
+    }
+    close(fd);
+    
+    try {
+        return json::from_msgpack(body);
+    } catch (const json::exception& e) {
+        return json{
+            {"success", false},
+            {"error", std::string("Failed to decode daemon response: ") + e.what()}
+        };
+    }
+}
+
+json PolymarketClient::execute(const std::string& cmd, const json& args, const std::string& cli_args) {
+    if (auto response = execute_daemon(cmd, args)) {
+        return *response;
+    }
+    return execute_python(cli_args);
+}
+
 OrderResult PolymarketClient::place_order(
     const std::string& token_id,
     const std::string& side,
@@ -183,15 +367,11 @@ OrderResult PolymarketClient::place_order(
     std::cout << "[LIVE] Placing order: " << side << " " << size 
               << " @ $" << price << std::endl;
     
-    auto response = execute_python(cmd.str());
+    auto response = execute("place", {
+        {"token_id", token_id}, {"side", side}, {"size", size}, {"price", price}
+    }, cmd.str());
     
-    OrderResult result;
-    result.success = response.value("success", false);
-    result.order_id = response.value("order_id", "");
-    result.status = response.value("status", "");
-    result.filled_amount = response.value("size", 0.0);
-    result.price = response.value("price", price);
-    result.error = response.value("error", "");
+    OrderResult result = parse_order_result(response, price);
     
     if (result.success) {
         std::cout << "[LIVE] ✓ Order placed: " << result.order_id << std::endl;
@@ -202,6 +382,49 @@ OrderResult PolymarketClient::place_order(
     return result;
 }
 
+std::vector<OrderResult> PolymarketClient::place_orders(const std::vector<OrderRequest>& orders) {
+    json requests = json::array();
+    for (const auto& order : orders) {
+        requests.push_back({
+            {"cmd", "place"},
+            {"args", {
+                {"token_id", order.token_id}, {"side", order.side},
+                {"size", order.size}, {"price", order.price}
+            }}
+        });
+    }
+    
+    std::cout << "[LIVE] Placing " << orders.size() << " orders" << std::endl;
+    
+    auto response = execute_daemon("batch", {{"requests", requests}});
+    
+    std::vector<OrderResult> results;
+    if (!response) {
+        // No daemon: one script call per order
+        for (const auto& order : orders) {
+            results.push_back(place_order(order.token_id, order.side, order.size, order.price));
+        }
+        return results;
+    }
+    
+    const json& entries = response->contains("results") ? (*response)["results"] : json::array();
+    for (size_t i = 0; i < orders.size(); ++i) {
+        if (i < entries.size()) {
+            results.push_back(parse_order_result(entries[i], orders[i].price));
+        } else {
+            OrderResult failed;
+            failed.error = response->value("error", "Missing result from executor daemon");
+            results.push_back(failed);
+        }
+        
+        if (!results.back().success) {
+            std::cerr << "[LIVE] ✗ Order failed: " << results.back().error << std::endl;
+        }
+    }
+    
+    return results;
+}
+
 OrderResult PolymarketClient::place_market_order(
     const std::string& token_id,
     const std::string& side,
@@ -214,7 +437,9 @@ OrderResult PolymarketClient::place_market_order(
     
     std::cout << "[LIVE] Placing market order: " << side << " " << size << std::endl;
     
-    auto response = execute_python(cmd.str());
+    auto response = execute("market", {
+        {"token_id", token_id}, {"side", side}, {"size", size}
+    }, cmd.str());
     
     OrderResult result;
     result.success = response.value("success", false);
@@ -238,17 +463,35 @@ bool PolymarketClient::cancel_order(const std::string& order_id) {
     std::ostringstream cmd;
     cmd << "cancel --order-id \"" << order_id << "\"";
     
-    auto response = execute_python(cmd.str());
+    auto response = execute("cancel", {{"order_id", order_id}}, cmd.str());
+    return response.value("success", false);
+}
+
+bool PolymarketClient::cancel_orders(const std::vector<std::string>& order_ids) {
+    if (order_ids.empty()) {
+        return true;
+    }
+    
+    std::ostringstream ids;
+    for (size_t i = 0; i < order_ids.size(); ++i) {
+        if (i > 0) ids << ",";
+        ids << order_ids[i];
+    }
+    
+    std::ostringstream cmd;
+    cmd << "cancel-many --order-ids \"" << ids.str() << "\"";
+    
+    auto response = execute("cancel-many", {{"order_ids", order_ids}}, cmd.str());
     return response.value("success", false);
 }
 
 bool PolymarketClient::cancel_all_orders() {
-    auto response = execute_python("cancel-all");
+    auto response = execute("cancel-all", json::object(), "cancel-all");
     return response.value("success", false);
 }
 
 BalanceResult PolymarketClient::get_balance() {
-    auto response = execute_python("balance");
+    auto response = execute("balance", json::object(), "balance");
     
     BalanceResult result;
     result.success = response.value("success", false);
@@ -260,7 +503,7 @@ BalanceResult PolymarketClient::get_balance() {
 }
 
 PositionsResult PolymarketClient::get_positions() {
-    auto response = execute_python("positions");
+    auto response = execute("positions", json::object(), "positions");
     
     PositionsResult result;
     result.success = response.value("success", false);
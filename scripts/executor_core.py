@@ -0,0 +1,958 @@
+"""
+Polymarket Order Executor core
+Client setup, order placement, account queries and the command table
+shared by the CLI and the daemon in order_executor.py.
+
+Kept free of CLI and socket handling so it can be compiled with mypyc
+(`make build-executor`); order_executor.py loads the compiled module
+while it was built from this exact source, and this file otherwise.
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import types
+import operator
+import threading
+import importlib.util
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Collection, Dict, Iterable, List, Optional, Tuple
+
+# orjson is optional: it is several times faster than json
+_loads: Callable[[Any], Any]
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# py_clob_client (and web3/eth_account behind it) is imported on first use
+# by _import_clob_client(), so --help and the daemon start instantly
+ClobClient: Any = None
+OrderArgs: Any = None
+OrderType: Any = None
+ApiCreds: Any = None
+BUY: Any = None
+SELL: Any = None
+
+# (best_bid, best_ask); None for an empty side
+Quote = Tuple[Optional[float], Optional[float]]
+
+# (token_id, side, size) of a market the order pool signs for
+Market = Tuple[str, str, float]
+
+# Polymarket endpoints
+CLOB_HOST = "https://clob.polymarket.com"
+CHAIN_ID = 137  # Polygon mainnet
+
+# Connections kept open to the CLOB API, shared by concurrent requests
+HTTP_POOL_SIZE = 64
+HTTP_KEEPALIVE_SECONDS = 60.0
+
+MARKET_WS_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
+
+# The market feed is pinged this often; a pong missing for the timeout
+# drops the connection, which is then reopened. WebSocket quotes are
+# trusted while the feed was heard from within one ping and its timeout.
+FEED_PING_SECONDS = 5.0
+FEED_PING_TIMEOUT_SECONDS = 3.0
+
+# Price tolerance past top-of-book for market (FOK) orders
+MARKET_ORDER_SLIPPAGE = 0.002
+
+
+def _normalize_private_key(private_key: Optional[str]) -> Optional[str]:
+    """Return the key with a 0x prefix, or None if unset."""
+    if not private_key:
+        return None
+    return private_key if private_key.startswith("0x") else "0x" + private_key
+
+
+# Credentials are fixed for the life of the process, so read them once
+_PRIVATE_KEY = _normalize_private_key(os.environ.get("POLYMARKET_PRIVATE_KEY"))
+_CREDENTIALS = {
+    "api_key": os.environ.get("POLYMARKET_API_KEY"),
+    "api_secret": os.environ.get("POLYMARKET_SECRET"),
+    "api_passphrase": os.environ.get("POLYMARKET_PASSPHRASE"),
+}
+_API_CREDENTIALS = _CREDENTIALS if all(_CREDENTIALS.values()) else None
+
+# Shared client, built on first use and reused for the life of the process
+_CLIENT: Any = None
+_CLIENT_LOCK = threading.Lock()
+
+# Worker threads for overlapping independent HTTP round-trips
+_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="executor")
+
+# Separate workers for batched daemon requests, which themselves use _POOL
+_BATCH_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix="batch")
+
+# Top-of-book cache fed by the market WebSocket (daemon mode only)
+_BOOK_CACHE: Optional["TopOfBookCache"] = None
+
+# Orders signed ahead of time by a background thread (daemon mode only)
+_ORDER_POOL: Optional["PresignedOrderPool"] = None
+
+
+def _select_crypto_backends() -> None:
+    """
+    Sign with libsecp256k1 (coincurve) when it is installed; eth_keys'
+    pure-Python fallback is many times slower. Must run before eth_keys
+    creates its backend, i.e. before py_clob_client is imported.
+    """
+    if importlib.util.find_spec("coincurve") is not None:
+        os.environ.setdefault("ECC_BACKEND_CLASS", "eth_keys.backends.CoinCurveECCBackend")
+
+
+def _crypto_backends() -> str:
+    """Describe the secp256k1 and keccak implementations signing will use."""
+    try:
+        from eth_keys.backends import get_backend_class
+        from eth_hash.utils import auto_choose_backend
+        ecc = get_backend_class().__name__
+        keccak = auto_choose_backend().__name__.rsplit(".", 1)[-1]
+    except ImportError as e:
+        return f"unavailable ({e})"
+    
+    description = f"{ecc}, keccak via {keccak}"
+    if ecc == "NativeECCBackend":
+        description += " (pip install coincurve for faster signing)"
+    return description
+
+
+def _import_clob_client() -> None:
+    """Import the py_clob_client names used by this module into module scope."""
+    global ClobClient, OrderArgs, OrderType, ApiCreds, BUY, SELL
+    _select_crypto_backends()
+    try:
+        from py_clob_client import client, clob_types
+        from py_clob_client.order_builder import constants
+    except ImportError:
+        raise ImportError("py-clob-client not installed. Run: pip install py-clob-client")
+    
+    ClobClient = client.ClobClient
+    OrderArgs, OrderType, ApiCreds = clob_types.OrderArgs, clob_types.OrderType, clob_types.ApiCreds
+    BUY, SELL = constants.BUY, constants.SELL
+
+
+def _tune_http_client() -> None:
+    """
+    Give py_clob_client's shared HTTP client a larger, longer-lived
+    connection pool so bursts of orders don't wait on sockets or redo TLS.
+    Newer releases use a module-level httpx client (HTTP/2); older ones
+    call requests.request() without a session, which we swap for one.
+    """
+    from py_clob_client.http_helpers import helpers
+    
+    if hasattr(helpers, "_http_client"):
+        import httpx
+        old_client = helpers._http_client
+        helpers._http_client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=HTTP_POOL_SIZE,
+                max_keepalive_connections=HTTP_POOL_SIZE // 2,
+                keepalive_expiry=HTTP_KEEPALIVE_SECONDS,
+            ),
+        )
+        old_client.close()
+    elif hasattr(helpers, "requests"):
+        import requests
+        from requests.adapters import HTTPAdapter
+        
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=0
+        )
+        session.mount("https://", adapter)
+        
+        # A copy of the requests module whose request() goes through the session
+        shim = types.ModuleType("requests")
+        shim.__dict__.update(vars(requests))
+        setattr(shim, "request", session.request)
+        helpers.requests = shim
+
+
+def get_client() -> Any:
+    """Return the shared CLOB client, creating it on first use."""
+    global _CLIENT
+    if _CLIENT is None:
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                _CLIENT = _create_client()
+    return _CLIENT
+
+
+def _create_client() -> Any:
+    """Initialize the CLOB client with the credentials read at startup."""
+    _import_clob_client()
+    try:
+        _tune_http_client()
+    except ImportError:
+        pass  # Keep the SDK's default HTTP client
+    
+    if not _PRIVATE_KEY:
+        raise ValueError("POLYMARKET_PRIVATE_KEY environment variable not set")
+    
+    # Create client with or without API credentials
+    creds = ApiCreds(**_API_CREDENTIALS) if _API_CREDENTIALS else None
+    return ClobClient(
+        host=CLOB_HOST,
+        key=_PRIVATE_KEY,
+        chain_id=CHAIN_ID,
+        creds=creds
+    )
+
+
+def _round_to_tick(price: float, tick_size: Any) -> float:
+    """Round a price to the nearest multiple of the market's tick size."""
+    tick = float(tick_size)
+    decimals = len(str(tick_size).partition(".")[2])
+    return round(round(price / tick) * tick, decimals)
+
+
+def _tolerant_price(price: float, buy: bool, tick_size: Any) -> float:
+    """
+    Move a quote MARKET_ORDER_SLIPPAGE away from the book, by at least one
+    tick, so a FOK order still fills if the quote moves before it lands.
+    Clamped to the valid price range [tick, 1 - tick].
+    """
+    tick = float(tick_size)
+    # Whole ticks, rounded up; the epsilon keeps float noise from adding one
+    ticks = max(1, math.ceil(price * MARKET_ORDER_SLIPPAGE / tick - 1e-9))
+    tolerant = _round_to_tick(price + ticks * tick if buy else price - ticks * tick, tick_size)
+    return min(max(tolerant, tick), 1 - tick)
+
+
+def _best_prices(bid_prices: Iterable[Any], ask_prices: Iterable[Any]) -> Quote:
+    """
+    Return (best_bid, best_ask) from price levels, None for an empty side.
+    Levels are not assumed to be sorted best-first.
+    """
+    bids = [float(p) for p in bid_prices]
+    asks = [float(p) for p in ask_prices]
+    return (max(bids) if bids else None, min(asks) if asks else None)
+
+
+class TopOfBookCache:
+    """
+    Best bid/ask per token, kept current from Polymarket's market
+    WebSocket so market orders can price without a REST orderbook fetch.
+    Tokens are subscribed lazily the first time they are traded and
+    unsubscribed once not traded for max_idle seconds. Quotes are current
+    for as long as the connection is alive, which is judged by the last
+    message or pong rather than the last price change. Nothing connects
+    until start() is called.
+    """
+    
+    def __init__(self, url: str = MARKET_WS_URL, ping_interval: float = FEED_PING_SECONDS,
+                 ping_timeout: float = FEED_PING_TIMEOUT_SECONDS, max_idle: float = 120.0):
+        self._url = url
+        self._ping_interval = ping_interval
+        self._ping_timeout = ping_timeout
+        self._max_idle = max_idle
+        self._lock = threading.Lock()
+        self._quotes: Dict[str, Quote] = {}
+        # token_id -> monotonic time it was last read or subscribed
+        self._tokens: Dict[str, float] = {}
+        self._ws: Any = None
+        self._last_heard = 0.0  # monotonic time of the last message or pong
+        self._started = False
+        self._worker: Optional[threading.Thread] = None
+    
+    def start(self) -> None:
+        """Allow connecting; the feed opens once a token is subscribed."""
+        with self._lock:
+            self._started = True
+            self._start_worker()
+    
+    def _start_worker(self) -> None:
+        """Start the connection thread if due. Caller holds the lock."""
+        if self._started and self._tokens and self._worker is None:
+            self._worker = threading.Thread(target=self._run, name="book-cache", daemon=True)
+            self._worker.start()
+    
+    def get(self, token_id: str) -> Optional[Quote]:
+        """Return (best_bid, best_ask), or None if unknown or the feed has gone quiet."""
+        with self._lock:
+            if token_id in self._tokens:
+                self._tokens[token_id] = time.monotonic()
+            quote = self._quotes.get(token_id)
+            last_heard = self._last_heard
+        if quote is None or time.monotonic() - last_heard > self._ping_interval + self._ping_timeout:
+            return None
+        return quote
+    
+    def subscribe(self, token_id: str) -> None:
+        """Start streaming a token, connecting on first use."""
+        with self._lock:
+            subscribed = token_id in self._tokens
+            self._tokens[token_id] = time.monotonic()
+            if subscribed:
+                return
+            ws = self._ws
+            self._start_worker()
+        
+        if ws is not None:
+            try:
+                ws.send(json.dumps({"assets_ids": [token_id], "operation": "subscribe"}))
+            except Exception:
+                pass  # Picked up by the resubscribe on reconnect
+    
+    def _run(self) -> None:
+        import websocket
+        
+        while True:
+            app = websocket.WebSocketApp(
+                self._url,
+                on_open=self._on_open,
+                on_message=self._on_message,
+                on_pong=self._on_pong,
+                on_close=self._on_close,
+            )
+            # Returns, via _on_close(), on a close frame, a socket error or
+            # a missed pong, i.e. also when the feed dies without closing
+            app.run_forever(ping_interval=self._ping_interval, ping_timeout=self._ping_timeout)
+            time.sleep(1)
+    
+    def _drop_idle(self, now: float) -> None:
+        """Unsubscribe tokens not traded within max_idle seconds and forget their quotes."""
+        with self._lock:
+            idle = [t for t, used_at in self._tokens.items() if now - used_at >= self._max_idle]
+            for token_id in idle:
+                del self._tokens[token_id]
+                self._quotes.pop(token_id, None)
+            ws = self._ws
+        
+        if idle and ws is not None:
+            try:
+                ws.send(json.dumps({"assets_ids": idle, "operation": "unsubscribe"}))
+            except Exception:
+                pass  # Not resubscribed on reconnect either
+    
+    def _on_open(self, ws: Any) -> None:
+        self._drop_idle(time.monotonic())
+        with self._lock:
+            self._ws = ws
+            self._last_heard = time.monotonic()
+            tokens = list(self._tokens)
+        ws.send(json.dumps({"assets_ids": tokens, "type": "market"}))
+    
+    def _on_pong(self, ws: Any, data: Any) -> None:
+        with self._lock:
+            self._last_heard = time.monotonic()
+        # Pongs arrive every ping interval, so idle tokens go within one
+        self._drop_idle(time.monotonic())
+    
+    def _on_close(self, ws: Any, *args: Any) -> None:
+        # Quotes go stale while disconnected; fall back to REST until resynced
+        with self._lock:
+            self._ws = None
+            self._quotes.clear()
+    
+    def _on_message(self, ws: Any, message: Any) -> None:
+        with self._lock:
+            self._last_heard = time.monotonic()
+        
+        try:
+            events = _loads(message)
+        except ValueError:
+            return  # e.g. "PONG"
+        if isinstance(events, dict):
+            events = [events]
+        
+        updates: Dict[Any, Quote] = {}
+        for event in events:
+            if not isinstance(event, dict):
+                continue
+            if "bids" in event or "asks" in event:
+                # Full book snapshot
+                updates[event.get("asset_id")] = _best_prices(
+                    (level["price"] for level in event.get("bids") or ()),
+                    (level["price"] for level in event.get("asks") or ()),
+                )
+            for change in event.get("price_changes") or ():
+                if "best_bid" in change and "best_ask" in change:
+                    updates[change.get("asset_id")] = (
+                        float(change["best_bid"]) if change["best_bid"] else None,
+                        float(change["best_ask"]) if change["best_ask"] else None,
+                    )
+        updates.pop(None, None)
+        
+        if updates:
+            with self._lock:
+                # Skip tokens unsubscribed while their updates were in flight
+                for token_id, quote in updates.items():
+                    if token_id in self._tokens:
+                        self._quotes[token_id] = quote
+
+
+def _prefetch_order_metadata(client: Any, token_id: str) -> List["Future[Any]"]:
+    """
+    Start the per-token lookups create_order() would otherwise make one
+    after another (tick size, neg-risk flag, fee rate). The client caches
+    the results, so once these complete signing needs no network calls.
+    
+    Returns:
+        list of futures to wait on before signing
+    """
+    getters = (
+        getattr(client, name, None)
+        for name in ("get_tick_size", "get_neg_risk", "get_fee_rate_bps")
+    )
+    return [_POOL.submit(getter, token_id) for getter in getters if getter is not None]
+
+
+class PresignedOrderPool:
+    """
+    Orders signed ahead of time by a background thread so EIP-712 signing
+    stays off the order path. For each recently traded (token, side, size)
+    the pool keeps orders signed at the last price and a few ticks either
+    side. Every signed order has its own salt and is handed out once;
+    entries expire so a changed market fee rate is picked up, and markets
+    not traded for max_idle seconds stop being signed for. Nothing is
+    signed until start() is called.
+    """
+    
+    def __init__(self, ticks: int = 2, max_age: float = 30.0, max_markets: int = 16,
+                 max_idle: float = 120.0):
+        self._ticks = ticks
+        self._max_age = max_age
+        self._max_markets = max_markets
+        self._max_idle = max_idle
+        self._lock = threading.Lock()
+        # (token_id, side, price, size) -> (signed_at, signed order)
+        self._orders: Dict[Tuple[str, str, float, float], Tuple[float, Any]] = {}
+        # (token_id, side, size) -> (last traded price, last used), least recent first
+        self._markets: "OrderedDict[Market, Tuple[float, float]]" = OrderedDict()
+        self._wake = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+    
+    def start(self) -> None:
+        """Start the background signing thread."""
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, name="presigner", daemon=True)
+            self._worker.start()
+    
+    def take(self, token_id: str, side: str, price: float, size: float) -> Any:
+        """
+        Pop a pre-signed order for exactly these terms, or None on a miss.
+        Either way the pool starts signing around this price for next time.
+        """
+        market = (token_id, side, size)
+        with self._lock:
+            entry = self._orders.pop((token_id, side, round(price, 6), size), None)
+            self._markets[market] = (price, time.monotonic())
+            self._markets.move_to_end(market)
+            while len(self._markets) > self._max_markets:
+                self._drop(self._markets.popitem(last=False)[0])
+        self._wake.set()
+        
+        if entry is not None and time.monotonic() - entry[0] < self._max_age:
+            return entry[1]
+        return None
+    
+    def _drop(self, market: Market, keep: Collection[float] = ()) -> None:
+        """Remove a market's orders except the given prices. Caller holds the lock."""
+        token_id, side, size = market
+        for key in [k for k in self._orders
+                    if k[0] == token_id and k[1] == side and k[3] == size and k[2] not in keep]:
+            del self._orders[key]
+    
+    def _drop_idle(self, now: float) -> None:
+        """Forget markets not traded within max_idle seconds, and their orders."""
+        with self._lock:
+            while self._markets:
+                market, (_, used_at) = next(iter(self._markets.items()))
+                if now - used_at < self._max_idle:
+                    break
+                del self._markets[market]
+                self._drop(market)
+    
+    def _run(self) -> None:
+        while True:
+            # Wake on new interest, or periodically to replace expired orders
+            self._wake.wait(timeout=self._max_age / 2)
+            self._wake.clear()
+            self._drop_idle(time.monotonic())
+            with self._lock:
+                markets = [(market, price) for market, (price, _) in self._markets.items()]
+            for market, price in markets:
+                try:
+                    self._fill(market, price)
+                except Exception as e:
+                    print(f"[EXECUTOR] Pre-signing failed for {market[0][:20]}...: {e}",
+                          file=sys.stderr, flush=True)
+    
+    def _fill(self, market: Market, center: float) -> None:
+        token_id, side, size = market
+        client = get_client()
+        tick_size = client.get_tick_size(token_id)
+        tick = float(tick_size)
+        prices = {
+            _round_to_tick(center + k * tick, tick_size)
+            for k in range(-self._ticks, self._ticks + 1)
+        }
+        prices = {p for p in prices if tick <= p <= 1 - tick}
+        
+        now = time.monotonic()
+        with self._lock:
+            for key, (signed_at, _) in list(self._orders.items()):
+                if now - signed_at >= self._max_age:
+                    del self._orders[key]
+            self._drop(market, keep=prices)
+            missing = [p for p in prices if (token_id, side, p, size) not in self._orders]
+        
+        for price in missing:
+            signed = client.create_order(OrderArgs(
+                price=price,
+                size=size,
+                side=side,
+                token_id=token_id,
+            ))
+            with self._lock:
+                # The market may have been evicted while we were signing
+                if market in self._markets:
+                    self._orders[(token_id, side, price, size)] = (time.monotonic(), signed)
+
+
+def _sign_order(client: Any, order_args: Any,
+                metadata_futures: Optional[List["Future[Any]"]] = None) -> Any:
+    """
+    Sign an order, taking a pre-signed one from the daemon's pool when
+    the terms match.
+    
+    Args:
+        client: The CLOB client
+        order_args: Terms of the order
+        metadata_futures: Futures from _prefetch_order_metadata() if the
+            caller already started it
+    """
+    if _ORDER_POOL is not None:
+        signed = _ORDER_POOL.take(
+            order_args.token_id, order_args.side, order_args.price, order_args.size
+        )
+        if signed is not None:
+            return signed
+    
+    # Resolve market metadata in parallel rather than inside create_order
+    if metadata_futures is None:
+        metadata_futures = _prefetch_order_metadata(client, order_args.token_id)
+    wait(metadata_futures)
+    return client.create_order(order_args)
+
+
+def _field(obj: Any, name: str, default: Any = None) -> Any:
+    """Read a field from an SDK response that may be an object or a dict."""
+    if isinstance(obj, dict):
+        return obj.get(name, default)
+    return getattr(obj, name, default)
+
+
+def _order_result(response: Any, default_status: str, size: float, price: float,
+                  side: str) -> Dict[str, Any]:
+    """Build the success result for a posted order from any response shape."""
+    if isinstance(response, dict):
+        order_id = response.get("orderID", response.get("id", "unknown"))
+        status = response.get("status", default_status)
+    else:
+        order_id = getattr(response, "orderID", None) or str(response)
+        status = default_status
+    
+    return {
+        "success": True,
+        "order_id": order_id,
+        "status": status,
+        "size": size,
+        "price": price,
+        "side": side
+    }
+
+
+def place_order(token_id: str, side: str, size: float, price: float) -> Dict[str, Any]:
+    """
+    Place an order on Polymarket.
+    
+    Args:
+        token_id: The token ID to trade
+        side: "BUY" or "SELL"
+        size: Number of shares
+        price: Price per share (0.01 to 0.99)
+        
+    Returns:
+        dict with success status, order_id, and fill details
+    """
+    try:
+        client = get_client()
+        
+        # Convert side string to constant
+        order_side = BUY if side.upper() == "BUY" else SELL
+        
+        # Create order arguments
+        order_args = OrderArgs(
+            price=price,
+            size=size,
+            side=order_side,
+            token_id=token_id,
+        )
+        
+        # Create and sign the order
+        signed_order = _sign_order(client, order_args)
+        
+        # Post the order (GTC = Good Till Cancelled)
+        response = client.post_order(signed_order, OrderType.GTC)
+        
+        return _order_result(response, "POSTED", size, price, side)
+            
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "error_type": type(e).__name__
+        }
+
+
+def place_market_order(token_id: str, side: str, size: float) -> Dict[str, Any]:
+    """
+    Place a market order (FOK - Fill or Kill) on Polymarket.
+    This tries to fill immediately at the best available price.
+    
+    Args:
+        token_id: The token ID to trade
+        side: "BUY" or "SELL"
+        size: Number of shares
+        
+    Returns:
+        dict with success status, order_id, and fill details
+    """
+    try:
+        client = get_client()
+        
+        # Fetch the market metadata needed for signing in the background
+        metadata_futures = _prefetch_order_metadata(client, token_id)
+        
+        order_side = BUY if side.upper() == "BUY" else SELL
+        
+        # Best price from a fresh WebSocket quote; on a miss ask the /price
+        # endpoint for just the side we trade against instead of the full book
+        price: Optional[float]
+        quote = _BOOK_CACHE.get(token_id) if _BOOK_CACHE else None
+        if quote is not None:
+            best_bid, best_ask = quote
+            price = best_ask if order_side == BUY else best_bid
+        else:
+            if _BOOK_CACHE:
+                _BOOK_CACHE.subscribe(token_id)
+            book_side = SELL if order_side == BUY else BUY
+            quoted = _field(client.get_price(token_id, book_side), "price")
+            price = float(quoted) if quoted else None
+        
+        # Buying matches the best ask (lowest sell price),
+        # selling matches the best bid (highest buy price)
+        if price is None:
+            if order_side == BUY:
+                return {"success": False, "error": "No asks available"}
+            return {"success": False, "error": "No bids available"}
+        
+        # Tolerate a little movement past top-of-book so one FOK post fills,
+        # without ever pricing inside the quote or outside the valid range
+        wait(metadata_futures)
+        price = _tolerant_price(price, order_side == BUY, client.get_tick_size(token_id))
+        
+        # Create order arguments
+        order_args = OrderArgs(
+            price=price,
+            size=size,
+            side=order_side,
+            token_id=token_id,
+        )
+        
+        # Create and sign the order
+        signed_order = _sign_order(client, order_args, metadata_futures)
+        
+        # Post as FOK (Fill or Kill) for immediate execution
+        response = client.post_order(signed_order, OrderType.FOK)
+        
+        result = _order_result(response, "FILLED", size, price, side)
+        result["filled_size"] = _field(response, "filledSize", size)
+        return result
+            
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "error_type": type(e).__name__
+        }
+
+
+def get_balance() -> Dict[str, Any]:
+    """Get the current USDC balance from Polymarket."""
+    try:
+        client = get_client()
+        
+        # Get balance
+        balance = client.get_balance()
+        
+        return {
+            "success": True,
+            "balance": float(balance) if balance else 0.0,
+            "currency": "USDC"
+        }
+        
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "balance": 0.0
+        }
+
+
+_POSITION_FIELDS_ORDER = ("token_id", "size", "avgPrice")
+_POSITION_FIELDS = frozenset(_POSITION_FIELDS_ORDER)
+
+
+def _position_fields_with_defaults(pos: Dict[str, Any]) -> Tuple[Any, Any, Any]:
+    """Read position fields from a dict that may be missing some of them."""
+    return pos.get("token_id", ""), pos.get("size", 0), pos.get("avgPrice", 0)
+
+
+def get_positions() -> Dict[str, Any]:
+    """Get current positions from Polymarket."""
+    try:
+        client = get_client()
+        
+        # Get positions
+        positions = client.get_positions()
+        
+        # Pick the accessor once for the whole list rather than probing each
+        # position; the SDK returns either all dicts or all objects
+        positions = list(positions or ())
+        get: Callable[[Any], Any]
+        if positions and isinstance(positions[0], dict):
+            if all(_POSITION_FIELDS <= pos.keys() for pos in positions):
+                get = operator.itemgetter(*_POSITION_FIELDS_ORDER)
+            else:
+                get = _position_fields_with_defaults
+        else:
+            get = operator.attrgetter(*_POSITION_FIELDS_ORDER)
+        
+        position_list = [
+            {"token_id": token_id, "size": float(size), "avg_price": float(avg_price)}
+            for token_id, size, avg_price in map(get, positions)
+        ]
+        
+        return {
+            "success": True,
+            "positions": position_list
+        }
+        
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "positions": []
+        }
+
+
+def cancel_order(order_id: str) -> Dict[str, Any]:
+    """Cancel an existing order."""
+    try:
+        client = get_client()
+        
+        response = client.cancel(order_id)
+        
+        return {
+            "success": True,
+            "cancelled": True,
+            "order_id": order_id
+        }
+        
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+
+def cancel_many(order_ids: Any) -> Dict[str, Any]:
+    """
+    Cancel several orders with a single signed request. order_ids comes
+    straight from the request, so it is checked here rather than typed.
+    """
+    try:
+        # A bare string would otherwise be cancelled character by character
+        if not isinstance(order_ids, (list, tuple)) or not all(
+            isinstance(order_id, str) for order_id in order_ids
+        ):
+            return {"success": False, "error": "order_ids must be a list of order ID strings"}
+        if not order_ids:
+            return {"success": True, "cancelled": [], "not_cancelled": {}}
+        
+        client = get_client()
+        
+        response = client.cancel_orders(list(order_ids))
+        if not isinstance(response, dict) or "canceled" not in response:
+            # Unknown outcome: never report orders as pulled that may still rest
+            return {
+                "success": False,
+                "error": f"Unreadable cancel response: {response!r}",
+                "cancelled": [],
+                "not_cancelled": {}
+            }
+        
+        cancelled = response.get("canceled") or []
+        not_cancelled = response.get("not_canceled") or {}
+        missing = set(order_ids) - set(cancelled)
+        result = {
+            "success": not missing and not not_cancelled,
+            "cancelled": cancelled,
+            "not_cancelled": not_cancelled
+        }
+        if missing:
+            result["error"] = f"{len(missing)} of {len(order_ids)} orders not cancelled"
+        elif not_cancelled:
+            result["error"] = f"{len(not_cancelled)} orders not cancelled"
+        return result
+        
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+
+def cancel_all_orders() -> Dict[str, Any]:
+    """Cancel all open orders."""
+    try:
+        client = get_client()
+        
+        response = client.cancel_all()
+        
+        return {
+            "success": True,
+            "cancelled_all": True
+        }
+        
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+
+def derive_api_key() -> Dict[str, Any]:
+    """Derive API key from private key (first-time setup)."""
+    try:
+        client = get_client()
+        
+        # This derives a new API key
+        api_creds = client.derive_api_key()
+        
+        return {
+            "success": True,
+            "api_key": api_creds.api_key,
+            "api_secret": api_creds.api_secret,
+            "api_passphrase": api_creds.api_passphrase,
+            "message": "Save these credentials to your .env file!"
+        }
+        
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+
+# Commands reachable over the daemon socket, keyed by CLI subcommand name
+COMMANDS: Dict[str, Callable[..., Dict[str, Any]]] = {
+    "place": place_order,
+    "market": place_market_order,
+    "balance": get_balance,
+    "positions": get_positions,
+    "cancel": cancel_order,
+    "cancel-many": cancel_many,
+    "cancel-all": cancel_all_orders,
+    "derive-key": derive_api_key,
+}
+
+
+def handle_request(request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Dispatch one daemon request to its command.
+    
+    Args:
+        request: {"cmd": <command name>, "args": {<keyword arguments>}}.
+            Command names may use "_" in place of "-" (e.g. "cancel_many").
+        
+    Returns:
+        dict in the same shape the CLI prints for that command
+    """
+    name = request.get("cmd")
+    command = COMMANDS.get(str(name).replace("_", "-"))
+    if command is None:
+        return {"success": False, "error": f"Unknown command: {name}"}
+    
+    try:
+        return command(**(request.get("args") or {}))
+    except TypeError as e:
+        # Wrong or missing arguments for the command
+        return {
+            "success": False,
+            "error": str(e),
+            "error_type": type(e).__name__
+        }
+
+
+def run_batch(requests: List[Any]) -> Dict[str, Any]:
+    """
+    Run several daemon requests concurrently, e.g. a burst of orders, so
+    their exchange round-trips overlap instead of queueing.
+    
+    Args:
+        requests: list of {"cmd": ..., "args": {...}} requests
+        
+    Returns:
+        dict with overall success and per-request results in request order
+    """
+    futures: List[Optional["Future[Dict[str, Any]]"]] = []
+    for request in requests:
+        if not isinstance(request, dict) or request.get("cmd") == "batch":
+            futures.append(None)
+        else:
+            futures.append(_BATCH_POOL.submit(handle_request, request))
+    
+    results = [
+        future.result() if future is not None
+        else {"success": False, "error": "Invalid batch entry"}
+        for future in futures
+    ]
+    return {
+        "success": all(result.get("success", False) for result in results),
+        "results": results
+    }
+
+
+COMMANDS["batch"] = run_batch
+
+
+def start_daemon_services() -> None:
+    """
+    Start the background helpers only worth running in a long-lived
+    process: the WebSocket top-of-book cache and the pre-signed order pool.
+    """
+    global _BOOK_CACHE, _ORDER_POOL
+    try:
+        import websocket  # websocket-client
+        _BOOK_CACHE = TopOfBookCache()
+        _BOOK_CACHE.start()
+    except ImportError:
+        print("[EXECUTOR] websocket-client not installed; market orders use REST prices",
+              file=sys.stderr, flush=True)
+    _ORDER_POOL = PresignedOrderPool()
+    _ORDER_POOL.start()
+    
+    _select_crypto_backends()
+    print(f"[EXECUTOR] Signing backends: {_crypto_backends()}", file=sys.stderr, flush=True)
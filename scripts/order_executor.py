@@ -2,351 +2,183 @@
 """
 Polymarket Order Executor
 Handles EIP-712 signing and order placement for live trading.
-Called by the C++ trading engine.
+Called by the C++ trading engine, either once per command (JSON on stdout)
+or as a long-running daemon (`serve`) speaking length-prefixed msgpack
+over a Unix domain socket. The order logic itself lives in executor_core.
 """
 
 import os
 import sys
 import json
-import time
+import fcntl
+import signal
+import struct
 import argparse
-from decimal import Decimal
+import hashlib
+import socketserver
+from types import ModuleType
+from typing import Any, Callable
 
-try:
-    from py_clob_client.client import ClobClient
-    from py_clob_client.clob_types import OrderArgs, OrderType, ApiCreds
-    from py_clob_client.order_builder.constants import BUY, SELL
-except ImportError:
-    print(json.dumps({
-        "success": False,
-        "error": "py-clob-client not installed. Run: pip install py-clob-client"
-    }))
-    sys.exit(1)
+_SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
 
-# Polymarket endpoints
-CLOB_HOST = "https://clob.polymarket.com"
-CHAIN_ID = 137  # Polygon mainnet
+# `make build-executor` puts the mypyc build of executor_core here, with the
+# SHA-256 of the source it was built from in executor_core.sha256
+NATIVE_DIR = os.path.join(_SCRIPTS_DIR, "native")
 
 
-def get_client() -> ClobClient:
-    """Initialize the CLOB client with credentials from environment."""
-    private_key = os.environ.get("POLYMARKET_PRIVATE_KEY")
-    api_key = os.environ.get("POLYMARKET_API_KEY")
-    api_secret = os.environ.get("POLYMARKET_SECRET")
-    api_passphrase = os.environ.get("POLYMARKET_PASSPHRASE")
-    
-    if not private_key:
-        raise ValueError("POLYMARKET_PRIVATE_KEY environment variable not set")
-    
-    # Clean up private key format
-    if not private_key.startswith("0x"):
-        private_key = "0x" + private_key
-    
-    # Create client with or without API credentials
-    if api_key and api_secret and api_passphrase:
-        creds = ApiCreds(
-            api_key=api_key,
-            api_secret=api_secret,
-            api_passphrase=api_passphrase
-        )
-        client = ClobClient(
-            host=CLOB_HOST,
-            key=private_key,
-            chain_id=CHAIN_ID,
-            creds=creds
-        )
-    else:
-        client = ClobClient(
-            host=CLOB_HOST,
-            key=private_key,
-            chain_id=CHAIN_ID
-        )
-    
-    return client
-
-
-def place_order(token_id: str, side: str, size: float, price: float) -> dict:
+def _load_core() -> ModuleType:
     """
-    Place an order on Polymarket.
-    
-    Args:
-        token_id: The token ID to trade
-        side: "BUY" or "SELL"
-        size: Number of shares
-        price: Price per share (0.01 to 0.99)
-        
-    Returns:
-        dict with success status, order_id, and fill details
+    Import executor_core, using the compiled build in NATIVE_DIR only if it
+    was built from the current source; a stale build is skipped with a
+    warning rather than silently running old code.
     """
     try:
-        client = get_client()
-        
-        # Convert side string to constant
-        order_side = BUY if side.upper() == "BUY" else SELL
-        
-        # Create order arguments
-        order_args = OrderArgs(
-            price=price,
-            size=size,
-            side=order_side,
-            token_id=token_id,
-        )
-        
-        # Create and sign the order
-        signed_order = client.create_order(order_args)
-        
-        # Post the order (GTC = Good Till Cancelled)
-        response = client.post_order(signed_order, OrderType.GTC)
-        
-        # Parse response
-        if response and hasattr(response, 'orderID'):
-            return {
-                "success": True,
-                "order_id": response.orderID,
-                "status": "POSTED",
-                "size": size,
-                "price": price,
-                "side": side
-            }
-        elif isinstance(response, dict):
-            return {
-                "success": True,
-                "order_id": response.get("orderID", response.get("id", "unknown")),
-                "status": response.get("status", "POSTED"),
-                "size": size,
-                "price": price,
-                "side": side
-            }
+        with open(os.path.join(NATIVE_DIR, "executor_core.sha256")) as f:
+            built_from = f.read().split()[0]
+        with open(os.path.join(_SCRIPTS_DIR, "executor_core.py"), "rb") as f:
+            source = hashlib.sha256(f.read()).hexdigest()
+    except (OSError, IndexError):
+        pass  # Not built
+    else:
+        if built_from == source:
+            sys.path.insert(0, NATIVE_DIR)
         else:
-            return {
-                "success": True,
-                "order_id": str(response),
-                "status": "POSTED",
-                "size": size,
-                "price": price,
-                "side": side
-            }
-            
-    except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "error_type": type(e).__name__
-        }
-
-
-def place_market_order(token_id: str, side: str, size: float) -> dict:
-    """
-    Place a market order (FOK - Fill or Kill) on Polymarket.
-    This tries to fill immediately at the best available price.
+            print("[EXECUTOR] Compiled executor_core is out of date; using the source. "
+                  "Run: make build-executor", file=sys.stderr, flush=True)
     
-    Args:
-        token_id: The token ID to trade
-        side: "BUY" or "SELL"
-        size: Number of shares
-        
-    Returns:
-        dict with success status, order_id, and fill details
-    """
-    try:
-        client = get_client()
-        
-        # Get current orderbook to find best price
-        orderbook = client.get_order_book(token_id)
-        
-        order_side = BUY if side.upper() == "BUY" else SELL
-        
-        # Determine price based on side
-        if order_side == BUY:
-            # For buying, we need to match the best ask (lowest sell price)
-            if not orderbook.asks:
-                return {"success": False, "error": "No asks available"}
-            best_ask = float(orderbook.asks[0].price)
-            price = best_ask
-        else:
-            # For selling, we need to match the best bid (highest buy price)
-            if not orderbook.bids:
-                return {"success": False, "error": "No bids available"}
-            best_bid = float(orderbook.bids[0].price)
-            price = best_bid
-        
-        # Create order arguments
-        order_args = OrderArgs(
-            price=price,
-            size=size,
-            side=order_side,
-            token_id=token_id,
-        )
-        
-        # Create and sign the order
-        signed_order = client.create_order(order_args)
-        
-        # Post as FOK (Fill or Kill) for immediate execution
-        response = client.post_order(signed_order, OrderType.FOK)
-        
-        if response and hasattr(response, 'orderID'):
-            return {
-                "success": True,
-                "order_id": response.orderID,
-                "status": "FILLED",
-                "size": size,
-                "price": price,
-                "side": side
-            }
-        elif isinstance(response, dict):
-            return {
-                "success": True,
-                "order_id": response.get("orderID", response.get("id", "unknown")),
-                "status": response.get("status", "FILLED"),
-                "filled_size": response.get("filledSize", size),
-                "price": price,
-                "side": side
-            }
-        else:
-            return {
-                "success": True,
-                "order_id": str(response),
-                "status": "FILLED",
-                "size": size,
-                "price": price,
-                "side": side
-            }
-            
-    except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "error_type": type(e).__name__
-        }
+    import executor_core
+    return executor_core
 
 
-def get_balance() -> dict:
-    """Get the current USDC balance from Polymarket."""
-    try:
-        client = get_client()
-        
-        # Get balance
-        balance = client.get_balance()
-        
-        return {
-            "success": True,
-            "balance": float(balance) if balance else 0.0,
-            "currency": "USDC"
-        }
-        
-    except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "balance": 0.0
-        }
+core = _load_core()
 
+# orjson is optional: it is several times faster and encodes straight to bytes
+_dumps: Callable[[Any], bytes]
+try:
+    import orjson
+    _dumps = orjson.dumps
+except ImportError:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+    _dumps = _json_dumps
 
-def get_positions() -> dict:
-    """Get current positions from Polymarket."""
-    try:
-        client = get_client()
-        
-        # Get positions
-        positions = client.get_positions()
-        
-        position_list = []
-        for pos in positions:
-            position_list.append({
-                "token_id": pos.token_id if hasattr(pos, 'token_id') else pos.get('token_id', ''),
-                "size": float(pos.size) if hasattr(pos, 'size') else float(pos.get('size', 0)),
-                "avg_price": float(pos.avgPrice) if hasattr(pos, 'avgPrice') else float(pos.get('avgPrice', 0))
-            })
-        
-        return {
-            "success": True,
-            "positions": position_list
-        }
-        
-    except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "positions": []
-        }
+# msgpack frames the daemon protocol; only needed in serve mode
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Daemon socket the C++ engine connects to
+DEFAULT_SOCKET_PATH = "/tmp/polymkt.sock"
+
+# Daemon frames: little-endian uint32 payload length, then a msgpack payload
+_FRAME_HEADER = struct.Struct("<I")
+MAX_FRAME_SIZE = 1 << 20
+
+
+class ExecutorRequestHandler(socketserver.StreamRequestHandler):
+    """Answers length-prefixed msgpack requests on one client connection."""
+    
+    def handle(self):
+        while True:
+            header = self.rfile.read(_FRAME_HEADER.size)
+            if len(header) < _FRAME_HEADER.size:
+                return  # Client closed the connection
+            (length,) = _FRAME_HEADER.unpack(header)
+            if length > MAX_FRAME_SIZE:
+                return  # Not a peer speaking our protocol
+            payload = self.rfile.read(length)
+            if len(payload) < length:
+                return
+            
+            try:
+                request = msgpack.unpackb(payload, raw=False)
+            except Exception as e:
+                result = {"success": False, "error": f"Invalid request: {e}"}
+            else:
+                if isinstance(request, dict):
+                    result = core.handle_request(request)
+                else:
+                    result = {"success": False, "error": "Invalid request: expected a map"}
+            
+            frame = msgpack.packb(result, use_bin_type=True)
+            self.wfile.write(_FRAME_HEADER.pack(len(frame)) + frame)
 
 
-def cancel_order(order_id: str) -> dict:
-    """Cancel an existing order."""
-    try:
-        client = get_client()
-        
-        response = client.cancel(order_id)
-        
-        return {
-            "success": True,
-            "cancelled": True,
-            "order_id": order_id
-        }
-        
-    except Exception as e:
-        return {
-            "success": False,
-            "error": str(e)
-        }
+class ExecutorServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server handling each engine connection on its own thread."""
+    daemon_threads = True
 
 
-def cancel_all_orders() -> dict:
-    """Cancel all open orders."""
+def serve(socket_path: str = DEFAULT_SOCKET_PATH):
+    """Run the executor as a daemon so the client and imports stay warm."""
+    if msgpack is None:
+        print("[EXECUTOR] msgpack not installed. Run: pip install msgpack",
+              file=sys.stderr, flush=True)
+        sys.exit(1)
+    
+    # One daemon per socket: a second one would unlink the live socket and
+    # strand the first. The kernel drops the lock when this process exits.
+    lock_file = open(socket_path + ".lock", "a+")
     try:
-        client = get_client()
-        
-        response = client.cancel_all()
-        
-        return {
-            "success": True,
-            "cancelled_all": True
-        }
-        
-    except Exception as e:
-        return {
-            "success": False,
-            "error": str(e)
-        }
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        print(f"[EXECUTOR] Another executor is already serving on {socket_path}",
+              file=sys.stderr, flush=True)
+        sys.exit(1)
+    lock_file.truncate(0)
+    lock_file.write(f"{os.getpid()}\n")
+    lock_file.flush()
+    
+    # Replies travel over the socket; route stray prints (e.g. from the SDK)
+    # to the log rather than an inherited stdout nobody reads
+    sys.stdout = sys.stderr
+    
+    core.start_daemon_services()
+    
+    # Holding the lock, any existing socket was left behind by a dead daemon
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    
+    server = ExecutorServer(socket_path, ExecutorRequestHandler)
+    # Shut down (and remove the socket) on SIGTERM as well as Ctrl-C
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    print(f"[EXECUTOR] Serving on {socket_path}", file=sys.stderr, flush=True)
+    
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
 
 
-def derive_api_key() -> dict:
-    """Derive API key from private key (first-time setup)."""
-    try:
-        client = get_client()
-        
-        # This derives a new API key
-        api_creds = client.derive_api_key()
-        
-        return {
-            "success": True,
-            "api_key": api_creds.api_key,
-            "api_secret": api_creds.api_secret,
-            "api_passphrase": api_creds.api_passphrase,
-            "message": "Save these credentials to your .env file!"
-        }
-        
-    except Exception as e:
-        return {
-            "success": False,
-            "error": str(e)
-        }
+def _comma_list(value: str) -> list:
+    """argparse type for comma-separated IDs."""
+    return [item for item in value.split(",") if item]
 
 
-def main():
+def _build_parser() -> argparse.ArgumentParser:
+    """
+    Build the CLI parser. Option dests match the keyword arguments of the
+    COMMANDS functions, so parsed args dispatch the same way as daemon
+    requests.
+    """
     parser = argparse.ArgumentParser(description="Polymarket Order Executor")
     subparsers = parser.add_subparsers(dest="command", help="Command to execute")
     
     # Place order command
     place_parser = subparsers.add_parser("place", help="Place a limit order")
-    place_parser.add_argument("--token", required=True, help="Token ID")
+    place_parser.add_argument("--token", dest="token_id", required=True, help="Token ID")
     place_parser.add_argument("--side", required=True, choices=["BUY", "SELL"], help="Order side")
     place_parser.add_argument("--size", type=float, required=True, help="Number of shares")
     place_parser.add_argument("--price", type=float, required=True, help="Price per share")
     
     # Market order command
     market_parser = subparsers.add_parser("market", help="Place a market order (FOK)")
-    market_parser.add_argument("--token", required=True, help="Token ID")
+    market_parser.add_argument("--token", dest="token_id", required=True, help="Token ID")
     market_parser.add_argument("--side", required=True, choices=["BUY", "SELL"], help="Order side")
     market_parser.add_argument("--size", type=float, required=True, help="Number of shares")
     
@@ -360,38 +192,48 @@ def main():
     cancel_parser = subparsers.add_parser("cancel", help="Cancel an order")
     cancel_parser.add_argument("--order-id", required=True, help="Order ID to cancel")
     
+    # Cancel many command
+    cancel_many_parser = subparsers.add_parser("cancel-many", help="Cancel several orders at once")
+    cancel_many_parser.add_argument("--order-ids", type=_comma_list, required=True,
+                                    help="Comma-separated order IDs")
+    
     # Cancel all command
     subparsers.add_parser("cancel-all", help="Cancel all open orders")
     
     # Derive API key command
     subparsers.add_parser("derive-key", help="Derive API key from private key")
     
-    args = parser.parse_args()
+    # Daemon mode
+    serve_parser = subparsers.add_parser("serve", help="Run as a daemon on a Unix socket")
+    serve_parser.add_argument("--socket", dest="socket_path", default=DEFAULT_SOCKET_PATH,
+                              help="Socket path")
+    
+    return parser
+
+
+def main():
+    args = vars(_build_parser().parse_args())
+    command = args.pop("command")
     
-    result = {}
+    if command == "serve":
+        serve(**args)
+        return
     
-    if args.command == "place":
-        result = place_order(args.token, args.side, args.size, args.price)
-    elif args.command == "market":
-        result = place_market_order(args.token, args.side, args.size)
-    elif args.command == "balance":
-        result = get_balance()
-    elif args.command == "positions":
-        result = get_positions()
-    elif args.command == "cancel":
-        result = cancel_order(args.order_id)
-    elif args.command == "cancel-all":
-        result = cancel_all_orders()
-    elif args.command == "derive-key":
-        result = derive_api_key()
-    else:
+    # Same dispatch table the daemon uses
+    if command is None:
         result = {"success": False, "error": "Unknown command. Use --help for usage."}
+    else:
+        result = core.handle_request({"cmd": command, "args": args})
     
-    # Output as JSON for C++ to parse
-    print(json.dumps(result))
+    # Output as JSON for C++ to parse, in a single write
+    sys.stdout.buffer.write(_dumps(result) + b"\n")
+    sys.stdout.flush()
+    sys.stderr.flush()
     
-    # Exit with appropriate code
-    sys.exit(0 if result.get("success", False) else 1)
+    # Exit with appropriate code, skipping interpreter teardown: the result is
+    # already written, and the SDK's atexit handlers and connection pools
+    # have nothing left to do for a one-shot command
+    os._exit(0 if result.get("success", False) else 1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,274 @@
+"""
+Tests for executor_core. No SDK or network needed: the client is a stub.
+Run with: make test-executor
+"""
+
+import base64
+import hashlib
+import importlib.util
+import json
+import socket
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import executor_core as core
+
+
+class TolerantPriceTest(unittest.TestCase):
+    def test_buy_moves_at_least_one_tick_up(self):
+        self.assertEqual(core._tolerant_price(0.50, True, "0.01"), 0.51)
+        self.assertEqual(core._tolerant_price(0.05, True, "0.001"), 0.051)
+
+    def test_sell_moves_at_least_one_tick_down(self):
+        self.assertEqual(core._tolerant_price(0.50, False, "0.01"), 0.49)
+        self.assertEqual(core._tolerant_price(0.05, False, "0.001"), 0.049)
+
+    def test_rounds_slippage_away_from_the_quote(self):
+        # 0.2% of 0.75 is 1.5 ticks at 0.001
+        self.assertEqual(core._tolerant_price(0.75, True, "0.001"), 0.752)
+        self.assertEqual(core._tolerant_price(0.75, False, "0.001"), 0.748)
+
+    def test_whole_tick_slippage_is_not_rounded_up(self):
+        # 0.2% of 0.5 is exactly one 0.001 tick
+        self.assertEqual(core._tolerant_price(0.5, True, "0.001"), 0.501)
+        self.assertEqual(core._tolerant_price(0.5, False, "0.001"), 0.499)
+
+    def test_clamped_to_valid_range(self):
+        self.assertEqual(core._tolerant_price(0.99, True, "0.01"), 0.99)
+        self.assertEqual(core._tolerant_price(0.01, False, "0.01"), 0.01)
+
+
+class TopOfBookCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.now = 100.0
+        patcher = mock.patch.object(core.time, "monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = core.TopOfBookCache(max_idle=60.0)
+        self.cache.subscribe("token")
+        self.cache._on_message(None, json.dumps([
+            {"asset_id": "token", "bids": [{"price": "0.4"}], "asks": [{"price": "0.6"}]}
+        ]))
+
+    def test_unchanged_book_stays_valid_while_feed_is_alive(self):
+        for _ in range(60):
+            self.now += core.FEED_PING_SECONDS
+            self.cache._on_pong(None, b"")
+            self.assertEqual(self.cache.get("token"), (0.4, 0.6))
+
+    def test_silent_feed_misses(self):
+        self.now += core.FEED_PING_SECONDS + core.FEED_PING_TIMEOUT_SECONDS + 0.01
+        self.assertIsNone(self.cache.get("token"))
+
+    def test_disconnect_drops_quotes(self):
+        self.cache._on_close(None)
+        self.assertIsNone(self.cache.get("token"))
+
+    def test_idle_tokens_are_unsubscribed(self):
+        ws = mock.Mock()
+        self.cache._on_open(ws)
+        self.cache.subscribe("other")
+        self.now += 40.0
+        self.cache.get("token")  # Still traded
+
+        self.now += 30.0
+        self.cache._on_pong(ws, b"")
+        ws.send.assert_called_with(json.dumps({"assets_ids": ["other"], "operation": "unsubscribe"}))
+        self.assertEqual(self.cache.get("token"), (0.4, 0.6))
+
+        self.now += 61.0
+        self.cache._on_pong(ws, b"")
+        self.assertIsNone(self.cache.get("token"))
+
+        # Late updates for an unsubscribed token are not stored again
+        self.cache._on_message(ws, json.dumps([
+            {"asset_id": "token", "bids": [{"price": "0.4"}], "asks": [{"price": "0.6"}]}
+        ]))
+        self.assertEqual(self.cache._quotes, {})
+
+
+class MarketFeedServer:
+    """
+    Minimal WebSocket server standing in for the market feed. The first
+    connection hangs without answering pings or closing; later ones send
+    a book snapshot and answer pings.
+    """
+
+    def __init__(self):
+        self.connections = 0
+        self._listener = socket.create_server(("127.0.0.1", 0))
+        self.url = "ws://127.0.0.1:%d" % self._listener.getsockname()[1]
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def close(self):
+        self._listener.close()
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self._listener.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(target=self._serve, args=(conn, self.connections > 1),
+                             daemon=True).start()
+
+    def _serve(self, conn, healthy):
+        with conn:
+            reader = conn.makefile("rb")
+            key = b""
+            for line in iter(reader.readline, b"\r\n"):
+                if line.lower().startswith(b"sec-websocket-key:"):
+                    key = line.split(b":", 1)[1].strip()
+            accept = base64.b64encode(
+                hashlib.sha1(key + b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11").digest())
+            conn.sendall(b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+                         b"Connection: Upgrade\r\nSec-WebSocket-Accept: " + accept + b"\r\n\r\n")
+            while True:
+                header = reader.read(2)
+                if len(header) < 2:
+                    return
+                opcode, length = header[0] & 0x0F, header[1] & 0x7F
+                if length == 126:
+                    length = int.from_bytes(reader.read(2), "big")
+                mask = reader.read(4)
+                payload = bytes(b ^ mask[i % 4] for i, b in enumerate(reader.read(length)))
+                if not healthy:
+                    continue
+                if opcode == 0x1:  # Subscription
+                    book = json.dumps([{"asset_id": "token", "bids": [{"price": "0.4"}],
+                                        "asks": [{"price": "0.6"}]}]).encode()
+                    conn.sendall(bytes([0x81, len(book)]) + book)
+                elif opcode == 0x9:  # Ping
+                    conn.sendall(bytes([0x8A, len(payload)]) + payload)
+
+
+@unittest.skipUnless(importlib.util.find_spec("websocket"), "websocket-client not installed")
+class TopOfBookCacheFeedTest(unittest.TestCase):
+    def test_reconnects_when_feed_drops_without_closing(self):
+        server = MarketFeedServer()
+        self.addCleanup(server.close)
+        cache = core.TopOfBookCache(server.url, ping_interval=0.2, ping_timeout=0.1)
+        cache.subscribe("token")
+        cache.start()
+
+        deadline = time.monotonic() + 10
+        while cache.get("token") is None and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(cache.get("token"), (0.4, 0.6))
+        self.assertGreaterEqual(server.connections, 2)
+
+
+class StubClient:
+    def __init__(self, price):
+        self.price = price
+        self.orders = []
+
+    def get_price(self, token_id, side):
+        return {"price": str(self.price)}
+
+    def get_tick_size(self, token_id):
+        return "0.01"
+
+    def create_order(self, order_args):
+        return order_args
+
+    def post_order(self, order, order_type):
+        self.orders.append(order)
+        return {"success": True, "orderID": "1", "status": "matched"}
+
+
+class StubSdkTest(unittest.TestCase):
+    def setUp(self):
+        saved = {name: getattr(core, name) for name in
+                 ("_CLIENT", "BUY", "SELL", "OrderArgs", "OrderType", "_BOOK_CACHE", "_ORDER_POOL")}
+        self.addCleanup(lambda: [setattr(core, k, v) for k, v in saved.items()])
+        core.BUY, core.SELL = "BUY", "SELL"
+        core.OrderArgs = SimpleNamespace
+        core.OrderType = SimpleNamespace(FOK="FOK")
+        core._BOOK_CACHE = None
+        core._ORDER_POOL = None
+
+
+class PlaceMarketOrderTest(StubSdkTest):
+    def test_signs_past_the_quote(self):
+        core._CLIENT = client = StubClient(0.50)
+
+        buy = core.place_market_order("token", "BUY", 10)
+        sell = core.place_market_order("token", "SELL", 10)
+
+        self.assertTrue(buy["success"])
+        self.assertEqual([order.price for order in client.orders], [0.51, 0.49])
+        self.assertEqual((buy["price"], sell["price"]), (0.51, 0.49))
+
+
+class PresignedOrderPoolTest(StubSdkTest):
+    def test_idle_markets_stop_being_signed(self):
+        core._CLIENT = StubClient(0.50)
+        pool = core.PresignedOrderPool(max_idle=60.0)
+        pool.take("token", "BUY", 0.50, 10.0)
+
+        pool._drop_idle(core.time.monotonic() + 30.0)
+        self.assertIn(("token", "BUY", 10.0), pool._markets)
+
+        pool._drop_idle(core.time.monotonic() + 61.0)
+        self.assertEqual(pool._markets, {})
+        self.assertEqual(pool._orders, {})
+
+    def test_fills_around_the_last_price(self):
+        core._CLIENT = StubClient(0.50)
+        pool = core.PresignedOrderPool(ticks=2)
+        self.assertIsNone(pool.take("token", "BUY", 0.50, 10.0))
+
+        pool._fill(("token", "BUY", 10.0), 0.50)
+        self.assertEqual(sorted(key[2] for key in pool._orders), [0.48, 0.49, 0.5, 0.51, 0.52])
+
+        signed = pool.take("token", "BUY", 0.51, 10.0)
+        self.assertEqual((signed.price, signed.size, signed.side), (0.51, 10.0, "BUY"))
+        self.assertIsNone(pool.take("token", "BUY", 0.51, 10.0))  # Handed out once
+
+
+class CancelManyTest(StubSdkTest):
+    def test_rejects_anything_but_a_list_of_ids(self):
+        core._CLIENT = client = mock.Mock()
+        for order_ids in ("abc", ["a", 1], {"a": 1}, None):
+            result = core.cancel_many(order_ids)
+            self.assertFalse(result["success"], order_ids)
+        client.cancel_orders.assert_not_called()
+
+    def test_accepts_a_tuple_of_ids(self):
+        core._CLIENT = client = mock.Mock()
+        client.cancel_orders.return_value = {"canceled": ["a"], "not_canceled": {}}
+        self.assertTrue(core.cancel_many(("a",))["success"])
+        client.cancel_orders.assert_called_once_with(["a"])
+
+    def test_cancels_a_list_of_ids(self):
+        core._CLIENT = client = mock.Mock()
+        client.cancel_orders.return_value = {"canceled": ["a", "b"], "not_canceled": {}}
+        result = core.cancel_many(["a", "b"])
+        self.assertTrue(result["success"])
+        client.cancel_orders.assert_called_once_with(["a", "b"])
+
+    def test_refused_cancels_fail(self):
+        core._CLIENT = client = mock.Mock()
+        client.cancel_orders.return_value = {
+            "canceled": ["a"], "not_canceled": {"b": "order can't be found"}
+        }
+        result = core.cancel_many(["a", "b"])
+        self.assertFalse(result["success"])
+        self.assertEqual(result["cancelled"], ["a"])
+
+    def test_unreadable_response_claims_no_cancels(self):
+        core._CLIENT = client = mock.Mock()
+        for response in (None, {}, {"not_canceled": {}}):
+            client.cancel_orders.return_value = response
+            result = core.cancel_many(["a", "b"])
+            self.assertFalse(result["success"], response)
+            self.assertEqual(result["cancelled"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()